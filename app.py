@@ -3,32 +3,147 @@ Flask API for Dublin City Facilities Knowledge Graph
 Connects to GraphDB and provides REST endpoints for querying facilities data.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
+from flask_caching import Cache
 import requests
-from typing import Optional, Dict, List, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Optional, Dict, List, Any, Callable, Iterator, Tuple
+from types import MappingProxyType
+from cachetools import TTLCache
+import cachetools
+import numpy as np
+import orjson
+import shapely
 import shapely.wkt
 from shapely.geometry import mapping
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import hashlib
+import hmac
 import os
 import re
+import threading
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson."""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Hand orjson's bytes straight to the response instead of via str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS),
+            mimetype=self.mimetype
+        )
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
+# Compress JSON/GeoJSON responses; /facilities payloads are large and repetitive
+app.config.update(
+    COMPRESS_MIMETYPES=['application/json', 'application/geo+json', 'application/x-ndjson'],
+    COMPRESS_LEVEL=5,
+    COMPRESS_MIN_SIZE=1024
+)
+Compress(app)
+
+# Response cache for filtered endpoints, keyed on the filter values each view uses
+# (see facilities_cache_key). A full /facilities page is 1-3 MB, so keep the
+# per-worker entry count small.
+cache = Cache(app, config={
+    'CACHE_TYPE': 'SimpleCache',
+    'CACHE_DEFAULT_TIMEOUT': 300,
+    'CACHE_THRESHOLD': int(os.environ.get("RESPONSE_CACHE_THRESHOLD", 32))
+})
+
 # GraphDB Configuration
 GRAPHDB_URL = os.environ.get("GRAPHDB_URL", "http://DESKTOP-FV6EDVG:7200/repositories/city_facilities")
 NAMESPACE = "http://example.org/dcc/facilities#"
 
-# Mapping of user-friendly IDs to URIs
-AREA_MAPPING = {
+# Bearer token for the state-changing admin endpoints; they are disabled when unset
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+
+# (connect, read) timeouts: fail fast when GraphDB is unreachable, allow slow queries
+GRAPHDB_TIMEOUT = (3.05, float(os.environ.get("GRAPHDB_TIMEOUT", 30)))
+
+# Shapely 2.x exposes vectorized WKT parsing (shapely.from_wkt / to_geojson)
+SHAPELY_2 = int(shapely.__version__.split('.')[0]) >= 2
+
+# Full-text search via a GraphDB Lucene index over schema:name (see README)
+USE_LUCENE = os.environ.get("USE_LUCENE", "false").lower() in ("1", "true", "yes")
+LUCENE_INDEX = os.environ.get("LUCENE_INDEX", "name_search")
+SEARCH_LIMIT_MAX = 500
+FACILITIES_PAGE_SIZE = 5000
+FACILITIES_LIMIT_MAX = 20000
+
+# Shared HTTP session so connections to GraphDB are kept alive and pooled.
+# SPARQL SELECTs are read-only, so retrying POSTs on gateway errors is safe.
+# Read timeouts and dropped connections are not retried: the query already ran
+# on GraphDB, and re-running a slow one would only multiply the wait.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=2,
+        read=False,
+        other=0,
+        backoff_factor=0.1,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False
+    )
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+SESSION.headers.update({
+    "Content-Type": "application/sparql-query",
+    "Accept": "application/sparql-results+json",
+    "Connection": "keep-alive"
+})
+
+# Runs independent SPARQL queries of a single request concurrently. A request submits
+# at most one query, so one slot per gunicorn worker connection never queues; under
+# gevent the pool's threads are greenlets and are only started when needed.
+SPARQL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 200)),
+    thread_name_prefix="sparql"
+)
+
+# SPARQL result cache: query hash -> parsed JSON, LRU-evicted with a TTL
+SPARQL_CACHE = TTLCache(maxsize=512, ttl=300)
+SPARQL_CACHE_LOCK = threading.RLock()
+SPARQL_CACHE_STATS = {"hits": 0, "misses": 0}
+
+# Facility details by URI; map clicks keep hitting the same facilities
+FACILITY_CACHE = TTLCache(maxsize=8192, ttl=300)
+FACILITY_CACHE_LOCK = threading.RLock()
+
+# Mapping of user-friendly IDs to URIs. These defaults are replaced by the areas
+# and facility types found in GraphDB once refresh_reference_data() succeeds.
+AREA_MAPPING = MappingProxyType({
     "north-central": "ex:NorthCentral",
     "north-west": "ex:NorthWest",
     "central": "ex:Central",
     "south-central": "ex:SouthCentral",
     "south-east": "ex:SouthEast",
-}
+})
 
-TYPE_MAPPING = {
+TYPE_MAPPING = MappingProxyType({
     "park": "ex:Park",
     "library": "ex:Library",
     "toilet": "ex:Toilet",
@@ -41,20 +156,84 @@ TYPE_MAPPING = {
     "disabled-parking": "ex:DisabledParking",
     "swimming-pool": "ex:SwimmingPool",
     "place-of-worship": "ex:PlaceOfWorship",
-}
+})
+
+
+def validate_mapping(mapping: Dict[str, str]) -> None:
+    """Each ID must map to its own prefixed ex: URI, or filters would silently overlap."""
+    uris = set(mapping.values())
+    if len(uris) != len(mapping) or not all(uri.startswith("ex:") for uri in uris):
+        raise ValueError(f"Invalid ID-to-URI mapping: {dict(mapping)}")
+
+
+validate_mapping(AREA_MAPPING)
+validate_mapping(TYPE_MAPPING)
 
+
+def reverse_mapping(mapping: Dict[str, str]) -> MappingProxyType:
+    """Map full URIs back to their IDs, expanding the ex: prefix."""
+    return MappingProxyType({NAMESPACE + uri[3:]: entry_id for entry_id, uri in mapping.items()})
+
+
+URI_TO_AREA_ID = reverse_mapping(AREA_MAPPING)
+URI_TO_TYPE_ID = reverse_mapping(TYPE_MAPPING)
+
+_KEBAB_RE = re.compile(r'(?<!^)(?=[A-Z])')
+
+
+@functools.lru_cache(maxsize=256)
 def to_kebab_case(s: str) -> str:
     """Convert CamelCase or PascalCase to kebab-case."""
-    return ''.join(['-' + c.lower() if c.isupper() else c for c in s]).lstrip('-')
+    return _KEBAB_RE.sub('-', s).lower()
 
 
+_TRAILING_COUNT_RE = re.compile(r'\s*\(\d+\)$')
+
+
+@functools.lru_cache(maxsize=4096)
 def clean_label(label: str) -> str:
     """Remove trailing facility counts in parentheses like '(123)'."""
     if not label:
         return ""
-    return re.sub(r'\s*\(\d+\)$', '', label).strip()
+    return _TRAILING_COUNT_RE.sub('', label).strip()
+
+
+def cached_sparql(enabled: bool = True) -> Callable:
+    """
+    Cache the results of a SPARQL-executing function in SPARQL_CACHE.
+    
+    Args:
+        enabled: Set to False to bypass the cache (e.g. for SPARQL UPDATE)
+        
+    Returns:
+        Decorator wrapping a function that takes a query string
+    """
+    def decorator(func: Callable[[str], Dict[str, Any]]) -> Callable[[str], Dict[str, Any]]:
+        if not enabled:
+            return func
+        
+        @functools.wraps(func)
+        def wrapper(query: str) -> Dict[str, Any]:
+            key = hashlib.blake2b(query.encode(), digest_size=16).digest()
+            with SPARQL_CACHE_LOCK:
+                cached = SPARQL_CACHE.get(key)
+                if cached is not None:
+                    SPARQL_CACHE_STATS["hits"] += 1
+                    return cached
+                SPARQL_CACHE_STATS["misses"] += 1
+            
+            # Query outside the lock so slow GraphDB calls don't serialize requests
+            results = func(query)
+            with SPARQL_CACHE_LOCK:
+                SPARQL_CACHE[key] = results
+            return results
+        
+        return wrapper
+    
+    return decorator
 
 
+@cached_sparql()
 def execute_sparql(query: str) -> Dict[str, Any]:
     """
     Execute a SPARQL query against GraphDB.
@@ -66,284 +245,716 @@ def execute_sparql(query: str) -> Dict[str, Any]:
         JSON response from GraphDB
     """
     try:
-        response = requests.post(
-            GRAPHDB_URL,
-            data=query,
-            headers={
-                "Content-Type": "application/sparql-query",
-                "Accept": "application/sparql-results+json"
-            },
-            timeout=30
-        )
+        # Encode explicitly: requests would send a str body as latin-1
+        response = SESSION.post(GRAPHDB_URL, data=query.encode('utf-8'), timeout=GRAPHDB_TIMEOUT)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except requests.exceptions.RequestException as e:
         print(f"GraphDB query error: {e}")
         raise
 
 
-def parse_bindings(results: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Parse SPARQL JSON results into clean Python dictionaries."""
-    bindings = results.get("results", {}).get("bindings", [])
-    parsed = []
+def etag_response(obj: Any, max_age: int = 300) -> Response:
+    """
+    Serialize obj to JSON with a weak ETag and public Cache-Control header.
+    
+    obj may also be an already-serialized JSON body (bytes). If-None-Match is
+    evaluated by evaluate_conditional_request(), so the full 200 response can
+    still be stored by the response cache.
+    """
+    if isinstance(obj, bytes):
+        payload = obj
+    else:
+        payload = orjson.dumps(obj, option=ORJSON_OPTIONS)
+    
+    response = app.response_class(payload, mimetype='application/json')
+    response.set_etag(hashlib.blake2b(payload, digest_size=8).hexdigest(), weak=True)
+    response.headers['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
+
+def debug_requested() -> bool:
+    """Whether to add the SPARQL debug block: ?debug=1, or when running in debug mode."""
+    return app.debug or request.args.get('debug') == '1'
+
+
+@app.after_request
+def evaluate_conditional_request(response: Response) -> Response:
+    """Turn ETagged responses into an empty 304 when the client's copy is current."""
+    # Runs before Flask-Compress, which leaves 304s alone. Covers responses served
+    # from the response cache too, as those bypass the view.
+    if response.status_code == 200 and 'ETag' in response.headers and not response.is_streamed:
+        response.make_conditional(request)
+    return response
+
+
+def escape_sparql_string(value: str) -> str:
+    """Escape a value for use inside a double-quoted SPARQL string literal."""
+    return (value.replace('\\', '\\\\')
+                 .replace('"', '\\"')
+                 .replace('\n', ' ')
+                 .replace('\r', ' '))
+
+
+_LUCENE_SPECIAL_RE = re.compile(r'([+\-&|!(){}\[\]^"~*?:\\/])')
+
+
+def escape_lucene_term(value: str) -> str:
+    """Escape Lucene query syntax characters in a user-supplied search term."""
+    return _LUCENE_SPECIAL_RE.sub(r'\\\1', value)
+
+
+_WKT_NUMBER = r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?'
+_WKT_POINT_RE = re.compile(
+    rf'\s*POINT\s*\(\s*({_WKT_NUMBER})\s+({_WKT_NUMBER})\s*\)\s*$',
+    re.IGNORECASE
+)
+
+
+def parse_wkt_geometries(wkt_strings: List[Optional[str]]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Parse WKT strings into GeoJSON geometry dicts in a single batch.
+    
+    Args:
+        wkt_strings: WKT per row, or None/empty for rows without geometry
+        
+    Returns:
+        GeoJSON geometry per row, or None where there was no WKT or it failed to parse
+    """
+    geometries: List[Optional[Dict[str, Any]]] = [None] * len(wkt_strings)
+    wkt_indices = []
+    for i, wkt in enumerate(wkt_strings):
+        if not wkt:
+            continue
+        # Plain 2D points are parsed directly; everything else goes to shapely
+        point = _WKT_POINT_RE.match(wkt)
+        if point:
+            geometries[i] = {
+                "type": "Point",
+                "coordinates": [float(point.group(1)), float(point.group(2))]
+            }
+        else:
+            wkt_indices.append(i)
+    if not wkt_indices:
+        return geometries
     
-    for binding in bindings:
-        row = {}
-        for key, value in binding.items():
-            row[key] = value.get("value")
-        parsed.append(row)
+    if SHAPELY_2:
+        geoms = shapely.from_wkt(
+            np.asarray([wkt_strings[i] for i in wkt_indices], dtype=object),
+            on_invalid='ignore'
+        )
+        indices = np.asarray(wkt_indices)
+        
+        # Single-ring 2D polygons: read every vertex into one coordinate buffer
+        # and slice it, rather than round-tripping each through a GeoJSON string
+        simple = ((shapely.get_type_id(geoms) == 3)
+                  & (shapely.get_num_interior_rings(geoms) == 0)
+                  & ~shapely.has_z(geoms)
+                  & ~shapely.is_empty(geoms))
+        if simple.any():
+            polygons = geoms[simple]
+            coords = shapely.get_coordinates(polygons).tolist()
+            start = 0
+            for i, count in zip(indices[simple].tolist(), shapely.get_num_coordinates(polygons).tolist()):
+                geometries[i] = {"type": "Polygon", "coordinates": [coords[start:start + count]]}
+                start += count
+        
+        rest = ~simple
+        for i, geojson_str in zip(indices[rest].tolist(), shapely.to_geojson(geoms[rest])):
+            if geojson_str is not None:
+                geometries[i] = orjson.loads(geojson_str)
+    else:
+        for i in wkt_indices:
+            try:
+                geometries[i] = mapping(shapely.wkt.loads(wkt_strings[i]))
+            except Exception:
+                pass
     
-    return parsed
+    return geometries
+
+
+def iter_bindings(results: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield SPARQL JSON result rows as plain dictionaries, one at a time."""
+    _get = dict.get
+    return ({key: _get(value, "value") for key, value in binding.items()}
+            for binding in results.get("results", {}).get("bindings", ()))
+
+
+def parse_bindings(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Parse SPARQL JSON results into clean Python dictionaries."""
+    return list(iter_bindings(results))
 
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
     try:
-        # Test GraphDB connection
+        # Test GraphDB connection (bypassing the cache so it's a live check)
         query = "SELECT * WHERE { ?s ?p ?o } LIMIT 1"
-        execute_sparql(query)
+        execute_sparql.__wrapped__(query)
         return jsonify({"status": "healthy", "graphdb": "connected"})
     except Exception as e:
         return jsonify({"status": "unhealthy", "error": str(e)}), 503
 
 
-@app.route('/areas', methods=['GET'])
-def get_areas():
-    """Get list of all committee areas."""
-    query = """
+def require_admin_token(func: Callable) -> Callable:
+    """
+    Restrict a view to requests carrying 'Authorization: Bearer <ADMIN_TOKEN>'.
+    
+    Answers 404 when ADMIN_TOKEN is not configured and 401 for a missing or wrong token.
+    """
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if not ADMIN_TOKEN:
+            return jsonify({"error": "Not found"}), 404
+        
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+            return jsonify({"error": "Unauthorized"}), 401
+        return func(*args, **kwargs)
+    
+    return wrapper
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Report SPARQL cache usage."""
+    with SPARQL_CACHE_LOCK:
+        return jsonify({
+            "size": SPARQL_CACHE.currsize,
+            "maxsize": SPARQL_CACHE.maxsize,
+            "ttl": SPARQL_CACHE.ttl,
+            "hits": SPARQL_CACHE_STATS["hits"],
+            "misses": SPARQL_CACHE_STATS["misses"]
+        })
+
+
+@app.route('/cache/clear', methods=['POST'])
+@require_admin_token
+def cache_clear():
+    """Drop all cached SPARQL results."""
+    with SPARQL_CACHE_LOCK:
+        SPARQL_CACHE.clear()
+        SPARQL_CACHE_STATS["hits"] = 0
+        SPARQL_CACHE_STATS["misses"] = 0
+    with FACILITY_CACHE_LOCK:
+        FACILITY_CACHE.clear()
+    cache.clear()
+    return jsonify({"status": "cleared"})
+
+
+AREAS_QUERY = """
     PREFIX ex: <http://example.org/dcc/facilities#>
     PREFIX schema: <http://schema.org/>
     
-    SELECT ?uri ?name
+    SELECT ?uri ?name ?count
     WHERE {
       ?uri a ex:CommitteeArea ;
            schema:name ?name .
+      
+      # Count over the area-membership triples only, then join to the few areas
+      OPTIONAL {
+        SELECT ?uri (COUNT(?facility) AS ?count)
+        WHERE { ?facility ex:inCommitteeArea ?uri }
+        GROUP BY ?uri
+      }
     }
     ORDER BY ?name
     """
-    
-    try:
-        results = execute_sparql(query)
-        bindings = parse_bindings(results)
-        
-        areas = []
-        for row in bindings:
-            # Extract URI local name for ID
-            uri = row['uri']
-            area_id_raw = uri.split('#')[-1]
-            
-            areas.append({
-                "id": to_kebab_case(area_id_raw),
-                "name": clean_label(row['name']),
-                "uri": uri
-            })
-        
-        return jsonify({
-            "results": areas,
-            "debug": {
-                "sparqlQuery": query,
-                "description": "Retrieves all committee areas and counts the number of facilities in each area using a SPARQL aggregation query."
-            }
-        })
-    
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
 
-
-@app.route('/facility-types', methods=['GET'])
-def get_facility_types():
-    """Get list of all facility types."""
-    query = """
+FACILITY_TYPES_QUERY = """
     PREFIX ex: <http://example.org/dcc/facilities#>
     PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
     
-    SELECT ?uri ?name
+    SELECT ?uri ?name ?count
     WHERE {
       ?uri a ex:FacilityType ;
            rdfs:label ?name .
+      
+      OPTIONAL {
+        SELECT ?uri (COUNT(?facility) AS ?count)
+        WHERE { ?facility ex:hasFacilityType ?uri }
+        GROUP BY ?uri
+      }
     }
     ORDER BY ?name
     """
+
+# Serialized /areas and /facility-types responses keyed by (name, with debug block),
+# rebuilt by refresh_reference_data()
+REFERENCE_PAYLOADS: Dict[Tuple[str, bool], bytes] = {}
+REFERENCE_LOCK = threading.Lock()
+REFERENCE_REFRESH_INTERVAL = int(os.environ.get("REFERENCE_REFRESH_INTERVAL", 300))
+
+_LOCAL_NAME_RE = re.compile(r'[A-Za-z][A-Za-z0-9_]*')
+
+
+def load_reference_list(query: str,
+                        uri_to_id: Dict[str, str]) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Run an area or facility-type enumeration query against GraphDB.
     
-    try:
-        results = execute_sparql(query)
-        bindings = parse_bindings(results)
+    Args:
+        query: AREAS_QUERY or FACILITY_TYPES_QUERY
+        uri_to_id: Current URI-to-ID mapping, so known URIs keep their IDs
         
-        types = []
-        for row in bindings:
-            uri = row['uri']
-            type_id_raw = uri.split('#')[-1]
+    Returns:
+        API entries for the listing endpoint, and an ID-to-prefixed-URI mapping.
+        Rows that can't be used as a filter are left out of both.
+    """
+    entries = []
+    mapping = {}
+    known_ids = set(uri_to_id.values())
+    for row in iter_bindings(execute_sparql.__wrapped__(query)):
+        uri = row['uri']
+        entry_id = uri_to_id.get(uri)
+        if entry_id is not None:
+            mapping[entry_id] = "ex:" + uri[len(NAMESPACE):]
+        else:
+            # New URI: derive the ID from its local name
+            local_name = uri.rsplit('#', 1)[-1]
+            entry_id = to_kebab_case(local_name)
             
-            types.append({
-                "id": to_kebab_case(type_id_raw),
-                "name": clean_label(row['name']),
-                "uri": uri
-            })
+            # Only plain local names in our namespace are safe to splice into queries,
+            # and an ID already in use would silently point to another URI
+            if (not uri.startswith(NAMESPACE) or not _LOCAL_NAME_RE.fullmatch(local_name)
+                    or entry_id in known_ids or entry_id in mapping):
+                print(f"Skipping reference entry {uri}: not usable as filter ID '{entry_id}'")
+                continue
+            mapping[entry_id] = f"ex:{local_name}"
         
-        return jsonify({
-            "results": types,
+        entries.append({
+            "id": entry_id,
+            "name": clean_label(row['name']),
+            "uri": uri,
+            "facilityCount": int(row.get('count') or 0)
+        })
+    
+    return entries, mapping
+
+
+def refresh_reference_data() -> None:
+    """Reload areas and facility types from GraphDB and rebuild the ID mappings."""
+    global AREA_MAPPING, TYPE_MAPPING, URI_TO_AREA_ID, URI_TO_TYPE_ID
+    
+    areas, area_mapping = load_reference_list(AREAS_QUERY, URI_TO_AREA_ID)
+    types, type_mapping = load_reference_list(FACILITY_TYPES_QUERY, URI_TO_TYPE_ID)
+    
+    # Raises before anything is swapped in, so a bad refresh keeps the current data
+    validate_mapping(area_mapping)
+    validate_mapping(type_mapping)
+    
+    payloads = {}
+    for name, entries, query, description in (
+        ("areas", areas, AREAS_QUERY,
+         "Retrieves all committee areas and counts the number of facilities in each area using a SPARQL aggregation query."),
+        ("facility-types", types, FACILITY_TYPES_QUERY,
+         "Retrieves all facility types (e.g., Park, Library) and counts the number of facilities of each type.")
+    ):
+        payloads[(name, False)] = orjson.dumps({"results": entries})
+        payloads[(name, True)] = orjson.dumps({
+            "results": entries,
             "debug": {
                 "sparqlQuery": query,
-                "description": "Retrieves all facility types (e.g., Park, Library) and counts the number of facilities of each type."
+                "description": description
             }
         })
     
+    with REFERENCE_LOCK:
+        # Keep the previous mapping rather than filtering everything out on an empty result
+        if area_mapping:
+            AREA_MAPPING = MappingProxyType(area_mapping)
+            URI_TO_AREA_ID = reverse_mapping(area_mapping)
+        if type_mapping:
+            TYPE_MAPPING = MappingProxyType(type_mapping)
+            URI_TO_TYPE_ID = reverse_mapping(type_mapping)
+        REFERENCE_PAYLOADS.update(payloads)
+
+
+def schedule_reference_refresh() -> None:
+    """Refresh reference data in the background every REFERENCE_REFRESH_INTERVAL seconds."""
+    def run():
+        try:
+            refresh_reference_data()
+        except Exception as e:
+            print(f"Reference data refresh failed: {e}")
+        schedule_reference_refresh()
+    
+    timer = threading.Timer(REFERENCE_REFRESH_INTERVAL, run)
+    timer.daemon = True
+    timer.start()
+
+
+def reference_response(name: str) -> Response:
+    """Serve a precomputed reference payload, loading it first if startup couldn't."""
+    key = (name, debug_requested())
+    payload = REFERENCE_PAYLOADS.get(key)
+    if payload is None:
+        try:
+            refresh_reference_data()
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+        payload = REFERENCE_PAYLOADS[key]
+    return etag_response(payload)
+
+
+@app.route('/areas', methods=['GET'])
+def get_areas():
+    """Get list of all committee areas."""
+    return reference_response("areas")
+
+
+@app.route('/facility-types', methods=['GET'])
+def get_facility_types():
+    """Get list of all facility types."""
+    return reference_response("facility-types")
+
+
+@app.route('/admin/refresh', methods=['POST'])
+@require_admin_token
+def admin_refresh():
+    """Reload areas and facility types from GraphDB now."""
+    try:
+        refresh_reference_data()
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+    return jsonify({
+        "status": "refreshed",
+        "areas": len(AREA_MAPPING),
+        "facilityTypes": len(TYPE_MAPPING)
+    })
 
 
-@app.route('/facilities', methods=['GET'])
-def get_facilities():
-    """Get facilities filtered by area and/or type."""
-    area_id = request.args.get('area')
-    type_ids = request.args.getlist('type')
-    
-    # Build SPARQL query with optional filters
-    area_filter = ""
-    type_filter = ""
-    
-    if area_id:
-        area_uri = AREA_MAPPING.get(area_id)
-        if area_uri:
-            area_filter = f"VALUES ?area {{ {area_uri} }}"
-    
-    if type_ids:
-        # Filter out invalid type IDs and get their URIs
-        type_uris = [TYPE_MAPPING.get(tid) for tid in type_ids if TYPE_MAPPING.get(tid)]
-        if type_uris:
-            # Create a space-separated string of URIs for the VALUES clause
-            uris_str = " ".join(type_uris)
-            type_filter = f"VALUES ?type {{ {uris_str} }}"
-    
-    query = f"""
+# One page of matching facilities. Shared by FACILITIES_QUERY and GEOMETRY_QUERY so
+# both select exactly the same rows, while still running independently.
+FACILITIES_PAGE_SUBQUERY = """{{
+        SELECT DISTINCT ?uri ?name ?lat ?lon ?area ?type
+        WHERE {{
+          VALUES ?area {{ {area_values} }}
+          VALUES ?type {{ {type_values} }}
+          
+          ?uri a ex:Facility ;
+               ex:inCommitteeArea ?area ;
+               ex:hasFacilityType ?type ;
+               schema:name ?name ;
+               ex:latitude ?lat ;
+               ex:longitude ?lon .
+        }}
+        ORDER BY ?name ?uri
+        LIMIT {limit}
+        OFFSET {offset}
+      }}"""
+
+FACILITIES_QUERY = """
     PREFIX ex: <http://example.org/dcc/facilities#>
     PREFIX schema: <http://schema.org/>
     PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
     PREFIX geo: <http://www.opengis.net/ont/geosparql#>
     
-    SELECT ?uri ?name ?lat ?lon ?address ?areaName ?typeName ?wkt
+    SELECT ?uri ?name ?lat ?lon ?address ?areaName ?typeName
     WHERE {{
-      {area_filter}
-      {type_filter}
-      
-      ?uri a ex:Facility ;
-           schema:name ?name ;
-           ex:latitude ?lat ;
-           ex:longitude ?lon ;
-           ex:inCommitteeArea ?area ;
-           ex:hasFacilityType ?type .
+      # Select and page the matching facilities first, then join labels onto that page
+      {page}
       
       ?area schema:name ?areaName .
       ?type rdfs:label ?typeName .
       
       OPTIONAL {{ ?uri schema:address ?address }}
-      OPTIONAL {{
+    }}
+    ORDER BY ?name ?uri
+    """
+
+# Geometry is fetched separately, and only for the facility types that carry polygons
+GEOMETRY_TYPES = frozenset({"ex:Park", "ex:RecyclingCentre"})
+
+GEOMETRY_QUERY = """
+    PREFIX ex: <http://example.org/dcc/facilities#>
+    PREFIX schema: <http://schema.org/>
+    PREFIX geo: <http://www.opengis.net/ont/geosparql#>
+    
+    SELECT ?uri ?geojson ?wkt
+    WHERE {{
+      # Only geometries of the facilities on the requested page
+      {page}
+      
+      VALUES ?type {{ {geometry_type_values} }}
+      
+      # GeoJSON precomputed at ingest is served as-is; WKT only where it is missing
+      {{ ?uri ex:geoJson ?geojson }}
+      UNION
+      {{
         ?uri geo:hasGeometry ?geo .
         ?geo geo:asWKT ?wkt .
+        FILTER NOT EXISTS {{ ?uri ex:geoJson ?stored }}
       }}
     }}
-    ORDER BY ?name
     """
+
+
+def is_cacheable_response(response: Any) -> bool:
+    """Only cache successful responses; error paths return (body, status) tuples."""
+    return not isinstance(response, tuple) and response.status_code == 200
+
+
+def parse_page() -> Tuple[int, int]:
+    """Read ?limit= and ?offset=, clamped to the allowed range. Raises ValueError."""
+    limit = int(request.args.get('limit', FACILITIES_PAGE_SIZE))
+    offset = int(request.args.get('offset', 0))
+    return max(1, min(limit, FACILITIES_LIMIT_MAX)), max(0, offset)
+
+
+def requested_type_uris() -> Optional[List[str]]:
+    """Sorted, de-duplicated URIs of the known ?type= IDs, or None without a type filter."""
+    type_ids = request.args.getlist('type')
+    if not type_ids:
+        return None
+    return sorted({uri for tid in type_ids if (uri := TYPE_MAPPING.get(tid))})
+
+
+def facilities_cache_key() -> str:
+    """
+    Response cache key for /facilities.
     
+    Built from the values the view actually uses, so reordered, repeated or
+    unknown ?type= IDs and unrelated parameters (e.g. ?_=...) share one entry.
+    """
     try:
-        results = execute_sparql(query)
-        bindings = parse_bindings(results)
+        page: Any = parse_page()
+    except ValueError:
+        # The view answers 400, which is never stored
+        page = "invalid"
+    return "facilities:" + orjson.dumps([
+        request.args.get('area'),
+        requested_type_uris(),
+        page,
+        request.args.get('stream') == '1',
+        debug_requested()
+    ]).decode()
+
+
+def stats_cache_key() -> str:
+    """Response cache key for /stats: the area filter and the debug flag."""
+    return "stats:" + orjson.dumps([request.args.get('area'), debug_requested()]).decode()
+
+
+def _iter_features(bindings: List[Dict[str, Any]],
+                   geometries: List[Optional[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+    """Yield a GeoJSON Feature per facility row, falling back to a Point geometry."""
+    for row, geometry in zip(bindings, geometries):
+        # Fallback to Point if no Polygon/WKT or parse failed
+        if not geometry:
+            geometry = {
+                "type": "Point",
+                "coordinates": [
+                    float(row['lon']),
+                    float(row['lat'])
+                ]
+            }
         
-        def parse_wkt_poly(wkt_str):
-            try:
-                geom = shapely.wkt.loads(wkt_str)
-                return mapping(geom)
-            except Exception:
-                return None
+        yield {
+            "type": "Feature",
+            "geometry": geometry,
+            "properties": {
+                "uri": row['uri'],
+                "name": clean_label(row['name']),
+                "address": row.get('address', ''),
+                "area": clean_label(row['areaName']),
+                "type": clean_label(row['typeName'])
+            }
+        }
 
-        # Convert to GeoJSON FeatureCollection
-        features = []
-        for row in bindings:
-            geometry = None
-            if row.get('wkt'):
-                # Try parsing WKT
-                geometry = parse_wkt_poly(row['wkt'])
-            
-            # Fallback to Point if no Polygon/WKT or parse failed
-            if not geometry:
-                geometry = {
-                    "type": "Point",
-                    "coordinates": [
-                        float(row['lon']),
-                        float(row['lat'])
-                    ]
-                }
 
-            feature = {
-                "type": "Feature",
-                "geometry": geometry,
-                "properties": {
-                    "uri": row['uri'],
-                    "name": clean_label(row['name']),
-                    "address": row.get('address', ''),
-                    "area": clean_label(row['areaName']),
-                    "type": clean_label(row['typeName'])
+@app.route('/facilities', methods=['GET'])
+@cache.cached(
+    timeout=300,
+    make_cache_key=facilities_cache_key,
+    unless=lambda: request.args.get('stream') == '1',
+    response_filter=is_cacheable_response
+)
+def get_facilities():
+    """Get facilities filtered by area and/or type."""
+    area_id = request.args.get('area')
+    
+    try:
+        limit, offset = parse_page()
+    except ValueError:
+        return jsonify({"error": "'limit' and 'offset' must be integers"}), 400
+    
+    # Unfiltered requests pass the full ID set, so the query text keeps one shape
+    area_uris = list(AREA_MAPPING.values())
+    type_uris = list(TYPE_MAPPING.values())
+    
+    if area_id:
+        area_uri = AREA_MAPPING.get(area_id)
+        if area_uri is None:
+            return jsonify({"error": f"Unknown area '{area_id}'"}), 400
+        area_uris = [area_uri]
+    
+    # Known type IDs only, sorted and de-duplicated so every permutation of ?type=
+    # yields the same query and response (and cache entry)
+    type_ids = []
+    requested_uris = requested_type_uris()
+    if requested_uris is not None:
+        type_ids = sorted({tid for tid in request.args.getlist('type') if tid in TYPE_MAPPING})
+        if not requested_uris:
+            # Only unknown types: nothing can match, so don't query GraphDB at all
+            if request.args.get('stream') == '1':
+                return Response(b"", mimetype='application/x-ndjson')
+            return etag_response({
+                "type": "FeatureCollection",
+                "features": [],
+                "metadata": {
+                    "count": 0,
+                    "limit": limit,
+                    "offset": offset,
+                    "filters": {
+                        "area": area_id,
+                        "type": type_ids
+                    }
                 }
-            }
-            features.append(feature)
+            })
+        type_uris = requested_uris
+    
+    page = FACILITIES_PAGE_SUBQUERY.format(
+        area_values=" ".join(area_uris),
+        type_values=" ".join(type_uris),
+        limit=limit,
+        offset=offset
+    )
+    query = FACILITIES_QUERY.format(page=page)
+    
+    # The geometry query selects the same page, so both can run concurrently
+    geometry_type_uris = [uri for uri in type_uris if uri in GEOMETRY_TYPES]
+    geometry_query = None
+    if geometry_type_uris:
+        geometry_query = GEOMETRY_QUERY.format(
+            page=page,
+            geometry_type_values=" ".join(geometry_type_uris)
+        )
+    
+    try:
+        # The whole response is cached by Flask-Caching, so skip the SPARQL result cache
+        geometry_future = SPARQL_EXECUTOR.submit(execute_sparql.__wrapped__, geometry_query) if geometry_query else None
+        results = execute_sparql.__wrapped__(query)
+        bindings = parse_bindings(results)
+        
+        wkt_by_uri: Dict[str, str] = {}
+        geojson_by_uri: Dict[str, str] = {}
+        if geometry_future is not None:
+            for row in iter_bindings(geometry_future.result()):
+                if row.get('geojson'):
+                    geojson_by_uri.setdefault(row['uri'], row['geojson'])
+                else:
+                    wkt_by_uri.setdefault(row['uri'], row['wkt'])
         
+        geometries = parse_wkt_geometries([wkt_by_uri.get(row['uri']) for row in bindings])
+        if geojson_by_uri:
+            for i, row in enumerate(bindings):
+                geojson = geojson_by_uri.get(row['uri'])
+                if geojson:
+                    try:
+                        geometries[i] = orjson.loads(geojson)
+                    except orjson.JSONDecodeError:
+                        pass
+        
+        if request.args.get('stream') == '1':
+            # Newline-delimited GeoJSON features, serialized as they are built
+            def generate():
+                for feature in _iter_features(bindings, geometries):
+                    yield orjson.dumps(feature) + b"\n"
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        # Convert to GeoJSON FeatureCollection
         geojson = {
             "type": "FeatureCollection",
-            "features": features,
+            "features": list(_iter_features(bindings, geometries)),
             "metadata": {
-                "count": len(features),
+                "count": len(bindings),
+                "limit": limit,
+                "offset": offset,
                 "filters": {
                     "area": area_id,
                     "type": type_ids
                 }
-            },
-            "debug": {
+            }
+        }
+        
+        if debug_requested():
+            geojson['debug'] = {
                 "sparqlQuery": query,
+                "geometryQuery": geometry_query,
                 "description": f"Retrieves facilities filtered by optional area ({area_id or 'all'}) and types ({', '.join(type_ids) if type_ids else 'all'}). Returns GeoJSON."
             }
-        }
         
-        return jsonify(geojson)
+        return etag_response(geojson)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# The overall total comes back as an extra "__TOTAL__" row from the same query.
+# Its subquery binds the label to ?label, as ?typeName is the projected alias.
+STATS_QUERY = """
+    PREFIX ex: <http://example.org/dcc/facilities#>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    
+    SELECT ?typeName ?count
+    WHERE {{
+      {{
+        SELECT ("__TOTAL__" AS ?typeName) (COUNT(?facility) AS ?count)
+        WHERE {{
+          VALUES ?area {{ {area_values} }}
+          
+          ?facility a ex:Facility ;
+                    ex:inCommitteeArea ?area ;
+                    ex:hasFacilityType ?type .
+          
+          ?type rdfs:label ?label .
+        }}
+      }}
+      UNION
+      {{
+        SELECT ?typeName (COUNT(?facility) AS ?count)
+        WHERE {{
+          VALUES ?area {{ {area_values} }}
+          
+          ?facility a ex:Facility ;
+                    ex:inCommitteeArea ?area ;
+                    ex:hasFacilityType ?type .
+          
+          ?type rdfs:label ?typeName .
+        }}
+        GROUP BY ?typeName
+      }}
+    }}
+    ORDER BY DESC(?count)
+    """
+
+
 @app.route('/stats', methods=['GET'])
+@cache.cached(
+    timeout=300,
+    make_cache_key=stats_cache_key,
+    response_filter=is_cacheable_response
+)
 def get_stats():
     """Get facility statistics for an area."""
     area_id = request.args.get('area')
     
-    # Build query with optional area filter
-    area_filter = ""
+    # Unfiltered requests pass the full area set, as in /facilities
+    area_uris = list(AREA_MAPPING.values())
     if area_id:
         area_uri = AREA_MAPPING.get(area_id)
-        if area_uri:
-            area_filter = f"FILTER(?area = {area_uri})"
+        if area_uri is None:
+            return jsonify({"error": f"Unknown area '{area_id}'"}), 400
+        area_uris = [area_uri]
     
-    query = f"""
-    PREFIX ex: <http://example.org/dcc/facilities#>
-    PREFIX schema: <http://schema.org/>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    
-    SELECT ?typeName (COUNT(?facility) AS ?count)
-    WHERE {{
-      ?facility a ex:Facility ;
-                ex:inCommitteeArea ?area ;
-                ex:hasFacilityType ?type .
-      
-      ?type rdfs:label ?typeName .
-      
-      {area_filter}
-    }}
-    GROUP BY ?typeName
-    ORDER BY DESC(?count)
-    """
+    query = STATS_QUERY.format(area_values=" ".join(area_uris))
     
     try:
-        results = execute_sparql(query)
-        bindings = parse_bindings(results)
+        # The whole response is cached by Flask-Caching, so skip the SPARQL result cache
+        results = execute_sparql.__wrapped__(query)
         
         stats = {
             "area": area_id,
@@ -351,41 +962,38 @@ def get_stats():
             "byType": []
         }
         
-        for row in bindings:
-            count = int(row['count'])
-            stats['total'] += count
+        for row in iter_bindings(results):
+            if row['typeName'] == "__TOTAL__":
+                stats['total'] = int(row['count'])
+                continue
             stats['byType'].append({
                 "type": clean_label(row['typeName']),
-                "count": count
+                "count": int(row['count'])
             })
         
-        stats['debug'] = {
-            "sparqlQuery": query,
-            "description": f"Aggregates facility counts by type for area: {area_id or 'all areas'}."
-        }
+        if debug_requested():
+            stats['debug'] = {
+                "sparqlQuery": query,
+                "description": f"Aggregates facility counts by type for area: {area_id or 'all areas'}."
+            }
         
-        return jsonify(stats)
+        return etag_response(stats)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-@app.route('/search', methods=['GET'])
-def search_facilities():
-    """Search facilities by name."""
-    search_term = request.args.get('q', '').lower()
-    limit = request.args.get('limit', 50)
-    
-    if not search_term:
-        return jsonify({"error": "Search query 'q' is required"}), 400
-    
-    query = f"""
+SEARCH_QUERY = """
     PREFIX ex: <http://example.org/dcc/facilities#>
     PREFIX schema: <http://schema.org/>
     PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    PREFIX luc: <http://www.ontotext.com/connectors/lucene#>
+    PREFIX luc-index: <http://www.ontotext.com/connectors/lucene/instance#>
     
     SELECT ?uri ?name ?typeName ?areaName ?lat ?lon
     WHERE {{
+      {match_clause}
+      
       ?uri a ex:Facility ;
            schema:name ?name ;
            ex:latitude ?lat ;
@@ -395,19 +1003,60 @@ def search_facilities():
       
       ?type rdfs:label ?typeName .
       ?area schema:name ?areaName .
-      
-      FILTER(CONTAINS(LCASE(?name), "{search_term}"))
     }}
     ORDER BY ?name
     LIMIT {limit}
     """
+
+SEARCH_CONTAINS_CLAUSE = """VALUES ?term {{ "{term}" }}
+      FILTER(CONTAINS(LCASE(?name), ?term))"""
+
+SEARCH_LUCENE_CLAUSE = """?search a luc-index:{index} ;
+              luc:query "{term}" ;
+              luc:entities ?uri ."""
+
+
+@app.route('/search', methods=['GET'])
+def search_facilities():
+    """Search facilities by name."""
+    search_term = request.args.get('q', '').lower()
+    
+    if not search_term:
+        return jsonify({"error": "Search query 'q' is required"}), 400
     
     try:
-        results = execute_sparql(query)
-        bindings = parse_bindings(results)
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer"}), 400
+    limit = max(1, min(limit, SEARCH_LIMIT_MAX))
+    
+    # The term is bound once via VALUES rather than spliced into the FILTER
+    contains_clause = SEARCH_CONTAINS_CLAUSE.format(term=escape_sparql_string(search_term))
+    
+    try:
+        results = None
+        if USE_LUCENE and search_term.strip():
+            # Every word must prefix-match the indexed name field; fall back to a
+            # scan if the connector is missing or the query is rejected.
+            lucene_query = " ".join(f"+name:{escape_lucene_term(word)}*" for word in search_term.split())
+            query = SEARCH_QUERY.format(
+                match_clause=SEARCH_LUCENE_CLAUSE.format(
+                    index=LUCENE_INDEX,
+                    term=escape_sparql_string(lucene_query)
+                ),
+                limit=limit
+            )
+            try:
+                results = execute_sparql(query)
+            except requests.exceptions.RequestException:
+                results = None
+        
+        if results is None:
+            query = SEARCH_QUERY.format(match_clause=contains_clause, limit=limit)
+            results = execute_sparql(query)
         
         facilities = []
-        for row in bindings:
+        for row in iter_bindings(results):
             facilities.append({
                 "uri": row['uri'],
                 "name": clean_label(row['name']),
@@ -419,87 +1068,137 @@ def search_facilities():
                 }
             })
         
-        return jsonify({
+        payload = {
             "query": search_term,
             "count": len(facilities),
-            "results": facilities,
-            "debug": {
+            "results": facilities
+        }
+        
+        if debug_requested():
+            payload['debug'] = {
                 "sparqlQuery": query,
                 "description": f"Searches for facilities with names containing '{search_term}' (case-insensitive)."
             }
-        })
+        
+        return jsonify(payload)
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-@app.route('/facility/<path:facility_id>', methods=['GET'])
-def get_facility_details(facility_id):
-    """Get detailed information for a specific facility."""
-    # Construct full URI if only ID provided
-    if not facility_id.startswith('http'):
-        facility_uri = f"<{NAMESPACE}facility/{facility_id}>"
-    else:
-        facility_uri = f"<{facility_id}>"
-    
-    query = f"""
+FACILITY_QUERY = """
     PREFIX ex: <http://example.org/dcc/facilities#>
     PREFIX schema: <http://schema.org/>
     PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    PREFIX geo: <http://www.opengis.net/ont/geosparql#>
     
     SELECT ?name ?address ?url ?lat ?lon ?areaName ?typeName ?sourceDataset
     WHERE {{
-      {facility_uri} schema:name ?name ;
-                     ex:latitude ?lat ;
-                     ex:longitude ?lon ;
-                     ex:inCommitteeArea ?area ;
-                     ex:hasFacilityType ?type .
+      VALUES ?uri {{ <{uri}> }}
+      
+      ?uri schema:name ?name ;
+           ex:latitude ?lat ;
+           ex:longitude ?lon ;
+           ex:inCommitteeArea ?area ;
+           ex:hasFacilityType ?type .
       
       ?area schema:name ?areaName .
       ?type rdfs:label ?typeName .
       
-      OPTIONAL {{ {facility_uri} schema:address ?address }}
-      OPTIONAL {{ {facility_uri} schema:url ?url }}
-      OPTIONAL {{ {facility_uri} ex:sourceDataset ?sourceDataset }}
+      OPTIONAL {{ ?uri schema:address ?address }}
+      OPTIONAL {{ ?uri schema:url ?url }}
+      OPTIONAL {{ ?uri ex:sourceDataset ?sourceDataset }}
     }}
     """
+
+# Characters allowed in a SPARQL IRIREF (no spaces, quotes, braces or angle brackets)
+_IRI_RE = re.compile(r'https?://[^\x00-\x20<>"{}|^`\\]+')
+
+
+@cachetools.cached(FACILITY_CACHE, lock=FACILITY_CACHE_LOCK)
+def fetch_facility(facility_uri: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a single facility in GraphDB.
+    
+    Args:
+        facility_uri: Full facility URI, already validated against _IRI_RE
+        
+    Returns:
+        Facility details, or None if the URI is not a known facility.
+        The result is shared through FACILITY_CACHE and must not be modified.
+    """
+    # Cached here, so skip the SPARQL result cache
+    results = execute_sparql.__wrapped__(FACILITY_QUERY.format(uri=facility_uri))
+    row = next(iter_bindings(results), None)
+    if row is None:
+        return None
+    
+    return {
+        "uri": facility_uri,
+        "name": clean_label(row['name']),
+        "type": clean_label(row['typeName']),
+        "area": clean_label(row['areaName']),
+        "coordinates": {
+            "lat": float(row['lat']),
+            "lon": float(row['lon'])
+        },
+        "address": row.get('address', ''),
+        "url": row.get('url', ''),
+        "sourceDataset": row.get('sourceDataset', '')
+    }
+
+
+@app.route('/facility/<path:facility_id>', methods=['GET'])
+def get_facility_details(facility_id):
+    """Get detailed information for a specific facility."""
+    # Construct full URI if only ID provided
+    if not facility_id.startswith('http'):
+        facility_uri = f"{NAMESPACE}facility/{facility_id}"
+    else:
+        facility_uri = facility_id
+    
+    # The URI is spliced into an IRI reference, so reject anything that could end it
+    if not _IRI_RE.fullmatch(facility_uri):
+        return jsonify({"error": "Invalid facility ID"}), 400
     
     try:
-        results = execute_sparql(query)
-        bindings = parse_bindings(results)
+        facility = fetch_facility(facility_uri)
         
-        if not bindings:
+        if facility is None:
             return jsonify({"error": "Facility not found"}), 404
         
-        row = bindings[0]
-        facility = {
-            "uri": facility_id if facility_id.startswith('http') else f"{NAMESPACE}facility/{facility_id}",
-            "name": clean_label(row['name']),
-            "type": clean_label(row['typeName']),
-            "area": clean_label(row['areaName']),
-            "coordinates": {
-                "lat": float(row['lat']),
-                "lon": float(row['lon'])
-            },
-            "address": row.get('address', ''),
-            "url": row.get('url', ''),
-            "sourceDataset": row.get('sourceDataset', '')
-        }
-        
-        facility['debug'] = {
-            "sparqlQuery": query,
-            "description": "Retrieves detailed information for a single facility, including its location, type, and area."
-        }
+        if not debug_requested():
+            return jsonify(facility)
         
-        return jsonify(facility)
+        return jsonify({
+            **facility,
+            "debug": {
+                "sparqlQuery": FACILITY_QUERY.format(uri=facility_uri),
+                "description": "Retrieves detailed information for a single facility, including its location, type, and area."
+            }
+        })
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+# Load areas/types once at startup; the hardcoded mappings above remain the fallback
+try:
+    refresh_reference_data()
+except Exception as e:
+    print(f"Could not preload reference data from GraphDB: {e}")
+schedule_reference_refresh()
+
 
 if __name__ == '__main__':
-    print("Starting Dublin City Facilities API on http://localhost:5000")
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    if os.environ.get("FLASK_ENV") != "development":
+        raise SystemExit(
+            "The Flask dev server is for local development only (set FLASK_ENV=development).\n"
+            "In production run: gunicorn -c gunicorn.conf.py wsgi:app"
+        )
+    
+    host = os.environ.get("FLASK_HOST", "0.0.0.0")
+    port = int(os.environ.get("FLASK_PORT", 5000))
+    debug = os.environ.get("FLASK_DEBUG", "false").lower() in ("1", "true", "yes")
+    print(f"Starting Dublin City Facilities API on http://localhost:{port}")
+    app.run(debug=debug, host=host, port=port)
 
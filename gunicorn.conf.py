@@ -0,0 +1,17 @@
+"""
+Gunicorn configuration for the Dublin City Facilities API.
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+
+# gevent workers monkey-patch the standard library when they boot, so the pooled
+# requests.Session sockets to GraphDB yield while waiting instead of blocking.
+worker_class = "gevent"
+workers = int(os.environ.get("GUNICORN_WORKERS", os.cpu_count() or 1))
+# app.py sizes its SPARQL executor from the same variable
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 200))
+
+keepalive = 30
@@ -257,6 +257,36 @@ def test_stats():
         return False
 
 
+def test_etag_revalidation():
+    """Test conditional GET with If-None-Match."""
+    print_test("ETag Revalidation (/facilities?type=park, /stats)")
+    
+    try:
+        ok = True
+        
+        for path, params in (('facilities', {'type': 'park'}), ('stats', {})):
+            response = requests.get(f"{API_BASE_URL}/{path}", params=params)
+            etag = response.headers.get('ETag')
+            if response.status_code != 200 or not etag:
+                print_error(f"/{path} returned {response.status_code} without an ETag")
+                ok = False
+                continue
+            
+            repeat = requests.get(f"{API_BASE_URL}/{path}", params=params,
+                                  headers={'If-None-Match': etag})
+            if repeat.status_code == 304 and not repeat.content:
+                print_success(f"/{path} answers 304 Not Modified for ETag {etag}")
+            else:
+                print_error(f"/{path} repeat returned {repeat.status_code}, expected 304")
+                ok = False
+        
+        return ok
+            
+    except Exception as e:
+        print_error(f"Error: {e}")
+        return False
+
+
 def test_search():
     """Test search endpoint."""
     print_test("Search Facilities (q=library)")
@@ -287,6 +317,110 @@ def test_search():
         return False
 
 
+def test_facilities_stream():
+    """Test streaming facilities as newline-delimited GeoJSON."""
+    print_test("Stream Facilities (type=park, stream=1)")
+    
+    try:
+        response = requests.get(
+            f"{API_BASE_URL}/facilities",
+            params={'type': 'park', 'stream': 1},
+            stream=True
+        )
+        
+        if response.status_code == 200:
+            content_type = response.headers.get('Content-Type', '')
+            if not content_type.startswith('application/x-ndjson'):
+                print_error(f"Unexpected Content-Type: {content_type}")
+                return False
+            
+            features = [json.loads(line) for line in response.iter_lines() if line]
+            if all(feature.get('type') == 'Feature' for feature in features):
+                print_success(f"Streamed {len(features)} GeoJSON features as NDJSON")
+                return True
+            
+            print_error("Stream contains lines that are not GeoJSON Features")
+            return False
+        else:
+            print_error(f"Failed: {response.status_code}")
+            print_info(f"Response: {response.text}")
+            return False
+            
+    except Exception as e:
+        print_error(f"Error: {e}")
+        return False
+
+
+def test_facilities_pagination():
+    """Test limit/offset paging on the facilities endpoint."""
+    print_test("Facilities Pagination (limit=2, offset=1)")
+    
+    try:
+        ok = True
+        
+        response = requests.get(f"{API_BASE_URL}/facilities", params={'limit': 2, 'offset': 1})
+        if response.status_code == 200:
+            metadata = response.json()['metadata']
+            if metadata.get('limit') == 2 and metadata.get('offset') == 1 and metadata['count'] <= 2:
+                print_success(f"Page echoed in metadata with {metadata['count']} features")
+            else:
+                print_error(f"Unexpected metadata: {metadata}")
+                ok = False
+        else:
+            print_error(f"Failed: {response.status_code}")
+            print_info(f"Response: {response.text}")
+            ok = False
+        
+        response = requests.get(f"{API_BASE_URL}/facilities", params={'limit': 'abc'})
+        if response.status_code == 400:
+            print_success(f"Non-integer limit rejected: {response.json()['error']}")
+        else:
+            print_error(f"Non-integer limit returned {response.status_code}, expected 400")
+            ok = False
+        
+        return ok
+            
+    except Exception as e:
+        print_error(f"Error: {e}")
+        return False
+
+
+def test_unknown_filters():
+    """Test that unknown filter IDs are rejected or match nothing."""
+    print_test("Unknown Filters (area=nowhere, type=no-such-type)")
+    
+    try:
+        ok = True
+        
+        for endpoint in ('facilities', 'stats'):
+            response = requests.get(f"{API_BASE_URL}/{endpoint}", params={'area': 'nowhere'})
+            if response.status_code == 400:
+                print_success(f"/{endpoint} rejects unknown area: {response.json()['error']}")
+            else:
+                print_error(f"/{endpoint} with unknown area returned {response.status_code}, expected 400")
+                ok = False
+        
+        response = requests.get(f"{API_BASE_URL}/facilities", params={'type': 'no-such-type'})
+        if response.status_code == 200:
+            geojson = response.json()
+            if (geojson.get('type') == 'FeatureCollection' and not geojson['features']
+                    and geojson['metadata']['count'] == 0):
+                print_success("Only unknown types return an empty FeatureCollection")
+            else:
+                print_error(f"Expected an empty FeatureCollection, got {geojson['metadata']['count']} features")
+                ok = False
+        else:
+            print_error(f"Failed: {response.status_code}")
+            print_info(f"Response: {response.text}")
+            ok = False
+        
+        return ok
+            
+    except Exception as e:
+        print_error(f"Error: {e}")
+        return False
+
+
 def run_all_tests():
     """Run all API tests."""
     print(f"\n{BLUE}{'='*60}{RESET}")
@@ -300,7 +434,11 @@ def run_all_tests():
         ("Facility Types Endpoint", test_facility_types),
         ("Facilities Endpoint (No Filter)", test_facilities_no_filter),
         ("Facilities Endpoint (With Filters)", test_facilities_with_filters),
+        ("Facilities Endpoint (Stream)", test_facilities_stream),
+        ("Facilities Endpoint (Pagination)", test_facilities_pagination),
+        ("Facilities Endpoint (Unknown Filters)", test_unknown_filters),
         ("Statistics Endpoint", test_stats),
+        ("ETag Revalidation", test_etag_revalidation),
         ("Search Endpoint", test_search),
     ]
     
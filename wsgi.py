@@ -0,0 +1,6 @@
+"""
+WSGI entry point for the Dublin City Facilities API.
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import app